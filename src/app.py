@@ -0,0 +1,135 @@
+"""RewritePro Streamlit UI; the scraping/rewriting pipeline lives in core.py."""
+import os
+import asyncio
+import logging
+import zipfile
+import tempfile
+import streamlit as st
+from openai import AuthenticationError, PermissionDeniedError
+
+from core import OPENAI_API_KEY, build_zip, normalize_url
+
+
+def main():
+    # Handlers are configured by the entry point, never on import.
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    # ----------------------------------
+    # 1) PAGE STYLING & GLOBAL SETTINGS
+    # ----------------------------------
+    st.set_page_config(page_title="🖌️ RewritePro", layout="wide")
+
+    # Custom CSS for styling
+    st.markdown(
+        """
+        <style>
+            /* Center and style the main title */
+            .main-title {
+                text-align: center;
+                font-size: 3rem;
+                font-weight: bold;
+                background: linear-gradient(90deg, #FF8A00, #E52E71);
+                -webkit-background-clip: text;
+                color: transparent;
+            }
+            /* Style the subtitle */
+            .sub-title {
+                text-align: center;
+                font-size: 1.2rem;
+                color: #555;
+                margin-bottom: 2rem;
+            }
+            /* Style the radio buttons horizontally */
+            .stRadio > div {
+                flex-direction: row;
+                gap: 1rem;
+            }
+        </style>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown("<div class='main-title'>🖌️ RewritePro 🖌️</div>", unsafe_allow_html=True)
+    st.markdown("<div class='sub-title'>Your AI‑powered Article Rewriter</div>", unsafe_allow_html=True)
+
+    if not OPENAI_API_KEY:
+        st.error("❌ OPENAI_API_KEY is missing. Please set it in your .env file.")
+        st.stop()
+
+    # -------------------------------
+    # 2) STREAMLIT UI LAYOUT
+    # -------------------------------
+
+    # 2.1 Article type selector
+    choice = st.radio(
+        "**Choose Article Type:**",
+        ("🍲 Food", "🌍 Travel", "🏥 Medical", "💰 Finance", "📝 General"),
+        index=0
+    )
+    article_type = choice.split()[1].lower()
+
+    # 2.2 URL input area
+    urls_input = st.text_area(
+        "🖇️  Paste your article URLs (one per line):",
+        height=200,
+        placeholder="https://example.com/article1\nhttps://example.com/article2"
+    )
+
+    # 2.3 Action button
+    start = st.button("🚀 Rewrite & Zip")
+
+    if not start:
+        return
+
+    raw_urls = [u.strip() for u in urls_input.splitlines() if u.strip()]
+    if not raw_urls:
+        st.warning("⚠️ Please enter at least one URL.")
+        st.stop()
+    # Keep the first spelling of each URL so a pasted duplicate costs no extra API call
+    unique = {}
+    for u in raw_urls:
+        unique.setdefault(normalize_url(u), u)
+    urls = list(unique.values())
+    if len(urls) < len(raw_urls):
+        st.caption(f"{len(raw_urls) - len(urls)} duplicate URL(s) removed.")
+
+    progress = st.empty()
+    live_area = st.container()
+
+    def show_progress(done, total):
+        progress.progress(done / total, text=f"{done}/{total} articles processed")
+
+    # One expander per article, filled in as its rewrite streams back
+    def show_live(idx, url):
+        return live_area.expander(url).empty().markdown
+
+    show_progress(0, len(urls))
+
+    # Articles are compressed straight into a file on disk as they finish,
+    # so rewritten text is never accumulated in memory.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_path = os.path.join(tmp_dir, "rewritten_articles.zip")
+        try:
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                success = asyncio.run(build_zip(
+                    zf, urls, article_type, on_progress=show_progress, live_view=show_live
+                ))
+        except (AuthenticationError, PermissionDeniedError) as e:
+            st.error(f"❌ OpenAI rejected the API key: {e}")
+            st.stop()
+
+        if success:
+            st.success(f"✅ {success} article(s) rewritten and ready!")
+            with open(zip_path, "rb") as zip_file:
+                st.download_button(
+                    "📦 Download ZIP of Rewritten Articles",
+                    data=zip_file,
+                    file_name="rewritten_articles.zip",
+                    mime="application/zip"
+                )
+        else:
+            st.error("❌ No articles could be processed. Please check your URLs.")
+
+
+if __name__ == "__main__":
+    main()
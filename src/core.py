@@ -0,0 +1,643 @@
+"""Scraping and rewriting pipeline shared by the RewritePro Streamlit apps."""
+import os
+import re
+import time
+import random
+import hashlib
+import json
+import asyncio
+import logging
+import streamlit as st
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APIError,
+    APIStatusError,
+    AuthenticationError,
+    InternalServerError,
+    PermissionDeniedError,
+    RateLimitError,
+)
+import httpx
+import diskcache
+from newspaper import Article
+from dotenv import load_dotenv
+from urllib.parse import urlsplit, urlunsplit
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# 1) ENVIRONMENT & SETTINGS
+# -------------------------------
+dotenv_path = os.getenv('DOTENV_PATH', None)
+if dotenv_path:
+    load_dotenv(dotenv_path)
+else:
+    load_dotenv()
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_MODEL_LONG = os.getenv("OPENAI_MODEL_LONG", OPENAI_MODEL)  # used for texts over LONG_TEXT_CHARS
+OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "1400"))  # ~800 words plus markup
+LONG_TEXT_CHARS = 4000
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "32"))
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "10"))
+SCRAPE_HOST_DELAY = float(os.getenv("SCRAPE_HOST_DELAY", "0.3"))  # gap between hits on one host
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "20"))
+OPENAI_MAX_RPM = int(os.getenv("OPENAI_MAX_RPM", "500"))
+OPENAI_MAX_TPM = int(os.getenv("OPENAI_MAX_TPM", "200000"))
+# Articles per request; above 1, rewrites are grouped to spare the RPM budget
+REWRITE_BATCH_SIZE = int(os.getenv("REWRITE_BATCH_SIZE", "1"))
+MAX_RETRIES = 5
+MAX_SLEEP_TIME = 60  # seconds of cumulative backoff per article
+RETRY_STATUSES = {502, 503, 504}  # transient upstream errors worth re-fetching
+# Characters, not words, so scripts written without spaces (Chinese,
+# Japanese, Thai) are measured the same way; ~150 and ~4000 English words
+MIN_ARTICLE_CHARS = int(os.getenv("MIN_ARTICLE_CHARS", "800"))  # shorter pages are stubs or paywalls
+MAX_ARTICLE_CHARS = int(os.getenv("MAX_ARTICLE_CHARS", "24000"))  # longer texts are cut to this
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache/rewritepro")
+EXTRACT_CACHE_TTL = 3600  # pages change; re-scrape after an hour
+REWRITE_CACHE_TTL = 30 * 86400
+
+
+# -------------------------------
+# 2) CLIENTS
+# -------------------------------
+def make_client():
+    """Fresh AsyncOpenAI client for one batch.
+
+    This module is imported once per process, but an AsyncOpenAI connection
+    pool cannot outlive the asyncio.run() that first used it, so each batch
+    opens (and closes) its own. Retries are handled in with_retries so
+    Retry-After can be honoured there.
+    """
+    return AsyncOpenAI(base_url='https://xiaoai.plus/v1', api_key=OPENAI_API_KEY, max_retries=0)
+
+
+class RateLimiter:
+    """Caps in-flight OpenAI calls and throttles them to per-minute request/token budgets."""
+
+    def __init__(self, max_concurrency, max_requests_per_min, max_tokens_per_min):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_requests_per_min = max_requests_per_min
+        self.max_tokens_per_min = max_tokens_per_min
+        self.available_requests = float(max_requests_per_min)
+        self.available_tokens = float(max_tokens_per_min)
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.available_requests = min(
+            self.max_requests_per_min,
+            self.available_requests + elapsed * self.max_requests_per_min / 60,
+        )
+        self.available_tokens = min(
+            self.max_tokens_per_min,
+            self.available_tokens + elapsed * self.max_tokens_per_min / 60,
+        )
+
+    async def acquire(self, tokens):
+        tokens = min(tokens, self.max_tokens_per_min)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                await asyncio.sleep(0.1)
+
+    def update_from_headers(self, headers):
+        # The server knows our real remaining quota; never assume more than it reports.
+        for header, attr in (("x-ratelimit-remaining-requests", "available_requests"),
+                             ("x-ratelimit-remaining-tokens", "available_tokens")):
+            try:
+                remaining = float(headers[header])
+            except (KeyError, TypeError, ValueError):
+                continue
+            setattr(self, attr, min(getattr(self, attr), remaining))
+
+
+@st.cache_resource
+def get_http_client():
+    """Shared HTTP/2 client for scraping, created once per process so pooled
+    connections survive reruns. A sync httpx.Client is thread-safe and not
+    tied to an event loop, so the scrape threads can all share it."""
+    return httpx.Client(
+        headers={"User-Agent": "Mozilla/5.0 (compatible; RewritePro/1.0)"},
+        follow_redirects=True,
+        transport=httpx.HTTPTransport(
+            http2=True,
+            retries=2,  # connection failures only; status retries are in fetch_article
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        ),
+    )
+
+
+@st.cache_resource
+def get_disk_cache():
+    """On-disk cache of extracted pages and finished rewrites, shared by all
+    sessions and kept across restarts, so rerunning a URL list (or retrying
+    the ones that failed) doesn't pay again for work already done."""
+    return diskcache.Cache(CACHE_DIR)
+
+
+# -------------------------------
+# 3) SCRAPING
+# -------------------------------
+def fetch_article(url):
+    """Download and parse url into (text, title); raises on failure so errors are never cached."""
+    timeout = httpx.Timeout(SCRAPE_TIMEOUT, connect=5)
+    for attempt in range(3):
+        response = get_http_client().get(url, timeout=timeout)
+        if response.status_code not in RETRY_STATUSES or attempt == 2:
+            break
+        time.sleep(0.3 * 2 ** attempt)
+    response.raise_for_status()
+    content_type = response.headers.get("Content-Type", "")
+    if "text/html" not in content_type:
+        raise ValueError(f"not an HTML page ({content_type or 'no content type'})")
+    article = Article(url)
+    # Without a charset in the header httpx would decode as UTF-8; bytes let
+    # newspaper detect the page's own <meta charset> (GBK, Shift_JIS, ...)
+    article.set_html(response.text if response.charset_encoding else response.content)
+    article.parse()
+    return article.text or '', article.title or 'article'
+
+
+def extract_text_from_url(url):
+    try:
+        text, title = fetch_article(url)
+        logger.info("Extracted %d characters from %s", len(text), url)
+        return text, title
+    except Exception as e:
+        logger.error("Failed to extract from %s: %s", url, e)
+        return None, None
+
+
+def fit_text(text, url):
+    """text clipped to MAX_ARTICLE_CHARS, or None if it is too short to be worth a rewrite."""
+    text = text.strip()
+    if len(text) < MIN_ARTICLE_CHARS:
+        logger.warning("Skipping %s: only %d characters", url, len(text))
+        return None
+    if len(text) > MAX_ARTICLE_CHARS:
+        logger.info("Truncating %s from %d to %d characters", url, len(text), MAX_ARTICLE_CHARS)
+        return text[:MAX_ARTICLE_CHARS]
+    return text
+
+
+def normalize_url(url):
+    """Dedup key for a URL: fragment and trailing slash dropped, host lower-cased."""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(netloc=parts.netloc.lower(), path=parts.path.rstrip("/"), fragment=""))
+
+
+# \W is exactly "not str.isalnum() and not _", so this matches the old per-char loop
+_UNSAFE_CHARS = re.compile(r"\W")
+
+
+def safe_title(title):
+    """Filename-safe version of title: non-alphanumerics become "_", max 50 chars."""
+    return _UNSAFE_CHARS.sub("_", title[:50])
+
+
+# -------------------------------
+# 4) PROMPTS
+# -------------------------------
+SYSTEM_PROMPT = "You are a professional editor creating high-quality, family-friendly content."
+
+PROMPT_CORE = """
+Rewrite the following article in about 600–800 words (no less than 600), avoiding plagiarism. Follow the structure and instructions below carefully:
+
+1. Start with an interactive intro (use “Lykkers”, “Friends”, or “Readers” when appropriate).
+2. Be specific, vivid, and thematic—avoid vague writing.
+3. Use clear subheadings. Each paragraph must:
+   • Have a subtitle ≤3 words.
+   • Be ≤4 lines.
+   • Begin with <h3> and end with </h3>.
+4. Bold all important terms with <b> and </b>.
+5. Avoid first-person language.
+6. No grammatical errors or AI‑style phrasing.
+7. Follow E‑E‑A‑T principles.
+8. Ensure correct English punctuation.
+9. Prohibited topics: war, religion, alcohol, nudity, politics, pork, beef, LGBTQ+ references, bars/clubs, skin color.
+10. Last paragraph is a reflective, actionable conclusion.
+"""
+
+# Per‐type specialties
+PROMPT_EXTRAS = {
+    "food": """
+Additional for Food:
+- Warm, sensory style: focus on taste, texture, aroma, presentation.
+- Include specific ingredients, techniques, local context.
+- Provide approximate ingredient costs, prep time, and tools.
+""",
+    "travel": """
+Additional for Travel:
+- Vivid scene: places, activities, transport, local culture, exact locations.
+- Include budget tips: routes, times, costs, packing list.
+- Highlight hidden gems or local secrets.
+""",
+    "medical": """
+Additional for Medical:
+- Professional tone, expert‑backed content.
+- Explain symptoms, diagnostic steps, treatments, when to seek care.
+- Reference authoritative terms (e.g., <b>CDC guidelines</b>, <b>clinical trials</b>).
+- Comply with YMYL: factual, no sensationalism.
+""",
+    "finance": """
+Additional for Finance:
+- Clear actionable advice: managing debt, saving, investing basics.
+- Include figures: fees, rates, common pitfalls.
+- Tone may be professional or relatable.
+- Live examples: <b>credit score</b>, <b>loan interest</b>, <b>emergency fund</b>.
+""",
+    "general": """
+Additional for General:
+- Clear, relaxed tone with everyday examples.
+- Offer fresh perspective on lifestyle/knowledge topics.
+- Avoid clichés or overly broad statements.
+""",
+}
+
+PROMPT_ENDING = """
+Finally:
+- Provide a global title ≤28 characters (creative, engaging).
+- Provide a summary ≤20 words using rhetoric (suspense, exaggeration, question, reversal).
+"""
+
+# Built once at import. Static instructions come first and the article
+# last, so every request in a batch shares the same cacheable prefix.
+PROMPTS = {
+    name: PROMPT_CORE + extra + PROMPT_ENDING + "\nArticle:\n{text}\n"
+    for name, extra in PROMPT_EXTRAS.items()
+}
+
+
+def get_prompt(text, article_type):
+    try:
+        template = PROMPTS[article_type]
+    except KeyError:
+        raise ValueError("Invalid article_type") from None
+    return template.format(text=text)
+
+
+def get_batch_prompt(texts, article_type):
+    """One prompt asking for every article in texts to be rewritten, answered as JSON."""
+    if article_type not in PROMPT_EXTRAS:
+        raise ValueError("Invalid article_type")
+    articles = "".join(f"\n=== Article {i} ===\n{text}\n" for i, text in enumerate(texts, start=1))
+    return (
+        PROMPT_CORE + PROMPT_EXTRAS[article_type] + PROMPT_ENDING
+        + f"\nApply all of the above to each of the {len(texts)} articles below, separately.\n"
+        + 'Reply with JSON only: {"rewrites": ["<rewrite of article 1>", "<rewrite of article 2>", ...]}, '
+        + "one complete rewrite (title and summary included) per article, in the same order.\n"
+        + articles
+    )
+
+
+# -------------------------------
+# 5) REWRITING
+# -------------------------------
+def retry_after_seconds(error):
+    """Server-requested wait from a 429 response, if it sent one."""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form; fall back to our own backoff
+    return None
+
+
+async def read_stream(stream, on_delta=None):
+    """Join a streamed completion into (text, finish_reason), calling on_delta(text_so_far) every ~0.5s."""
+    parts = []
+    finish_reason = None
+    last_update = time.monotonic()
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        parts.append(choice.delta.content or "")
+        finish_reason = choice.finish_reason or finish_reason
+        if on_delta and time.monotonic() - last_update >= 0.5:
+            on_delta("".join(parts))
+            last_update = time.monotonic()
+    return "".join(parts), finish_reason
+
+
+async def read_completion(completion):
+    """(text, finish_reason) of a non-streamed completion, like read_stream."""
+    choice = completion.choices[0]
+    return choice.message.content or "", choice.finish_reason
+
+
+async def with_retries(call):
+    """Await call() under the retry policy; returns its result, or None if it keeps failing or is rejected."""
+    backoff = 1.0
+    slept = 0.0
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            return await call()
+        except (AuthenticationError, PermissionDeniedError):
+            raise
+        except RateLimitError as e:
+            delay = retry_after_seconds(e) or backoff + random.random() * 0.5
+            backoff *= 2
+            logger.warning("Attempt %d rate limited; retrying in %.1fs", attempt, delay)
+        except (APIConnectionError, InternalServerError) as e:
+            delay = backoff + random.random() * 0.5
+            backoff *= 2
+            logger.error("Attempt %d failed: %s", attempt, e)
+        except APIStatusError as e:
+            logger.error("Request rejected, not retrying: %s", e)
+            return None
+        except (APIError, httpx.TransportError) as e:
+            # Errors raised mid-stream: an SSE error event, or the
+            # connection timing out or breaking while the reply is read
+            delay = backoff + random.random() * 0.5
+            backoff *= 2
+            logger.error("Attempt %d failed while streaming: %s", attempt, e)
+        except Exception:
+            logger.exception("Unexpected error on attempt %d, not retrying", attempt)
+            return None
+        if attempt == MAX_RETRIES or slept + delay > MAX_SLEEP_TIME:
+            break
+        slept += delay
+        await asyncio.sleep(delay)
+    logger.error("Giving up after %d attempt(s)", attempt)
+    return None
+
+
+async def request_completion(client, limiter, prompt, model, max_tokens, timeout, read, **kwargs):
+    """Send prompt under the rate limiter and retry policy.
+
+    read(parsed_response) turns the reply into (text, finish_reason) while
+    the concurrency slot is still held; returns its result, or None if the
+    request failed. Extra kwargs (stream, response_format, ...) go to create().
+    """
+    # ~4 chars per prompt token, plus the most the reply may use
+    estimated_tokens = len(prompt) // 4 + max_tokens
+
+    async def call():
+        async with limiter.semaphore:
+            await limiter.acquire(estimated_tokens)
+            raw = await client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.7,
+                timeout=timeout,
+                **kwargs
+            )
+            limiter.update_from_headers(raw.headers)
+            return await read(raw.parse())
+
+    return await with_retries(call)
+
+
+async def rewrite_article(client, limiter, text, article_type, on_delta=None):
+    """Stream one rewrite; returns (text, finish_reason), or (None, None) if the request failed."""
+    model = OPENAI_MODEL if len(text) < LONG_TEXT_CHARS else OPENAI_MODEL_LONG
+    result = await request_completion(
+        client, limiter, get_prompt(text, article_type), model, OPENAI_MAX_TOKENS, timeout=60,
+        read=lambda stream: read_stream(stream, on_delta), stream=True,
+    )
+    if result is None:
+        return None, None
+    content, finish_reason = result
+    if finish_reason == "length":
+        logger.warning("Rewrite hit max_tokens (%d); output may be cut short", OPENAI_MAX_TOKENS)
+    content = content.strip()
+    word_count = len(content.split())
+    if not 600 <= word_count <= 800:
+        logger.warning("Word count %d out of range.", word_count)
+    if on_delta:
+        on_delta(content)
+    return content, finish_reason
+
+
+async def rewrite_articles(client, limiter, texts, article_type):
+    """Rewrite several articles in a single JSON-mode request.
+
+    Returns one rewrite per text, or None if the reply can't be split back
+    into articles (bad JSON, wrong count, truncated output) or the request
+    failed; callers then fall back to rewrite_article for each text.
+    """
+    model = OPENAI_MODEL if all(len(text) < LONG_TEXT_CHARS for text in texts) else OPENAI_MODEL_LONG
+    result = await request_completion(
+        client, limiter, get_batch_prompt(texts, article_type), model, OPENAI_MAX_TOKENS * len(texts),
+        timeout=60 * len(texts), read=read_completion, response_format={"type": "json_object"},
+    )
+    if result is None:
+        return None
+    content, finish_reason = result
+    if finish_reason == "length":
+        logger.warning("Batch reply for %d articles hit max_tokens", len(texts))
+        return None
+    try:
+        rewrites = json.loads(content)["rewrites"]
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Batch reply for %d articles is not the expected JSON", len(texts))
+        return None
+    if (not isinstance(rewrites, list) or len(rewrites) != len(texts)
+            or not all(isinstance(r, str) and r.strip() for r in rewrites)):
+        logger.warning("Batch reply does not hold one rewrite for each of %d articles", len(texts))
+        return None
+    return [r.strip() for r in rewrites]
+
+
+class RewriteBatcher:
+    """Groups scraped articles into rewrite_articles calls of up to `size` each.
+
+    A batch goes out as soon as it is full, or once every scrape has finished
+    so the stragglers are not left waiting. Callers submit() a text and await
+    the returned future for (text, finish_reason), and must call scrape_done()
+    once per URL.
+    """
+
+    def __init__(self, client, limiter, article_type, size, expected):
+        self.client = client
+        self.limiter = limiter
+        self.article_type = article_type
+        self.size = size
+        self.outstanding = expected
+        self.pending = []
+        self.tasks = set()  # keeps in-flight batches from being garbage collected
+
+    def submit(self, text):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((text, future))
+        if len(self.pending) >= self.size:
+            self.flush()
+        return future
+
+    def scrape_done(self):
+        self.outstanding -= 1
+        if self.outstanding == 0:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        task = asyncio.ensure_future(self._send(batch))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, batch):
+        texts = [text for text, _ in batch]
+        try:
+            results = None
+            if len(texts) > 1:
+                rewrites = await rewrite_articles(self.client, self.limiter, texts, self.article_type)
+                if rewrites is not None:
+                    # rewrite_articles rejects cut-off replies, so these are complete
+                    results = [(rewritten, "stop") for rewritten in rewrites]
+            if results is None:
+                results = await asyncio.gather(*(
+                    rewrite_article(self.client, self.limiter, text, self.article_type) for text in texts
+                ))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# -------------------------------
+# 6) BATCH PIPELINE
+# -------------------------------
+async def process_urls(urls, article_type, live_view=None):
+    """Scrape and rewrite every URL concurrently, yielding (idx, title, url, rewritten) as each finishes.
+
+    live_view(idx, url), if given, returns a callback that receives the rewrite as it streams in.
+    """
+    loop = asyncio.get_running_loop()
+    # Different hosts are scraped in parallel, but each host sees one request
+    # at a time with a short gap after it, so a batch from a single site
+    # doesn't burst into its rate limiting or WAF.
+    host_locks = defaultdict(asyncio.Lock)
+    # One slot per worker thread, held until the thread is really done, so a
+    # scrape only starts its deadline once a worker is free to run it
+    scrape_slots = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    disk_cache = get_disk_cache()
+
+    async def scrape(url):
+        host_lock = host_locks[urlsplit(url).netloc.lower()]
+        await host_lock.acquire()
+        await scrape_slots.acquire()
+        job = loop.run_in_executor(executor, extract_text_from_url, url)
+        # Both are held until the thread is really done, even if we stop
+        # waiting for it, so a timed-out fetch still blocks its host
+        job.add_done_callback(lambda _: scrape_slots.release())
+        job.add_done_callback(lambda _: loop.call_later(SCRAPE_HOST_DELAY, host_lock.release))
+        try:
+            # Hard cap on the whole fetch + parse; the read timeout alone
+            # does not stop a server that trickles bytes slowly. Shielded so
+            # giving up doesn't mark the job done while its thread still runs.
+            text, title = await asyncio.wait_for(asyncio.shield(job), timeout=SCRAPE_TIMEOUT + 5)
+        except asyncio.TimeoutError:
+            logger.error("Timed out extracting %s", url)
+            return None, None
+        if text is not None:
+            disk_cache.set(("extract", url), (text, title), expire=EXTRACT_CACHE_TTL)
+        return text, title
+
+    async def rewrite_url(idx, url):
+        rewritten = future = None
+        try:
+            # A page scraped recently comes off disk and skips the host queue
+            cached = disk_cache.get(("extract", url))
+            text, title = cached if cached is not None else await scrape(url)
+            if text:
+                text = fit_text(text, url)
+            if text:
+                key = ("rewrite", hashlib.sha256(text.encode()).hexdigest(), article_type)
+                rewritten = disk_cache.get(key)
+                if rewritten is None and batcher:
+                    future = batcher.submit(text)
+        finally:
+            # Even on failure, so the last batch is never left waiting for this URL
+            if batcher:
+                batcher.scrape_done()
+        if not text:
+            return idx, title, url, None
+        if rewritten is not None:
+            logger.info("Reusing cached rewrite for %s", url)
+            if live_view:
+                live_view(idx, url)(rewritten)
+            return idx, title, url, rewritten
+        if future:
+            rewritten, finish_reason = await future
+            if rewritten and live_view:
+                live_view(idx, url)(rewritten)
+        else:
+            on_delta = live_view(idx, url) if live_view else None
+            rewritten, finish_reason = await rewrite_article(client, limiter, text, article_type, on_delta)
+        # A reply cut off at max_tokens is still handed out, but a retry
+        # should get a fresh attempt rather than the same truncated text
+        if rewritten and finish_reason != "length":
+            disk_cache.set(key, rewritten, expire=REWRITE_CACHE_TTL)
+        return idx, title, url, rewritten
+
+    async def process(idx, url):
+        # One bad article is skipped rather than ending the batch; only a
+        # rejected API key, which would fail every article, stops the run.
+        try:
+            return await rewrite_url(idx, url)
+        except (AuthenticationError, PermissionDeniedError):
+            raise
+        except Exception:
+            logger.exception("Failed to rewrite %s", url)
+            return idx, None, url, None
+
+    # Every scrape is dispatched up front on its own pool, so the scrape stage
+    # never waits on OpenAI slots; each rewrite then starts as soon as its
+    # own page is in rather than after the slowest page of the batch.
+    executor = ThreadPoolExecutor(max_workers=SCRAPE_CONCURRENCY)
+    limiter = RateLimiter(OPENAI_CONCURRENCY, OPENAI_MAX_RPM, OPENAI_MAX_TPM)
+    try:
+        async with make_client() as client:
+            # Batched rewrites come back whole, so their live view fills in at the end
+            batcher = None
+            if REWRITE_BATCH_SIZE > 1:
+                batcher = RewriteBatcher(client, limiter, article_type, REWRITE_BATCH_SIZE, len(urls))
+            for next_done in asyncio.as_completed([process(idx, url) for idx, url in enumerate(urls, start=1)]):
+                yield await next_done
+    finally:
+        # Don't block on scrapes that already timed out
+        executor.shutdown(wait=False)
+
+
+async def build_zip(zf, urls, article_type, on_progress=None, live_view=None):
+    """Write each rewritten article into zf as soon as it is ready; returns how many were written."""
+    done = 0
+    written = 0
+    # The event loop runs on the script thread, so zip writes and progress
+    # updates happen here, one at a time, while the work runs in threads.
+    async for idx, title, url, rewritten in process_urls(urls, article_type, live_view):
+        done += 1
+        if rewritten:
+            filename = f"{safe_title(title)}_{idx}.txt"
+            content = f"// {title} //\nSource: {url}\n\n{rewritten}"
+            zf.writestr(filename, content)
+            written += 1
+        if on_progress:
+            on_progress(done, len(urls))
+    return written